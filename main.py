@@ -13,7 +13,27 @@ from python.comparison.subsets_visualization import SubsetsVisualization
 from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
 from sklearn.cluster import AgglomerativeClustering
 
-def bias_metric_pipeline(file_path, speaking_style, custom_features, excluded_features=[]):
+def speaker_group_map(asr_performance_data: AsrPerformanceData):
+    """Map every audiofile to its demographic speaker group, using the metadata of the speaking style.
+    The metadata itself is only read once per file (see `AsrPerformanceData.get_meta_data`).
+
+    Parameters
+    ----------
+    asr_performance_data : AsrPerformanceData
+        The recognition output and metadata of the speaking style
+
+    Returns
+    -------
+    Series
+        The speaker group of each audiofile, indexed by 'Filename'
+    """
+    meta_data = asr_performance_data.get_meta_data()
+
+    # Group is consistent within speaker, so no aggregation is needed
+    return meta_data.drop_duplicates('Filename').set_index('Filename')['Group']
+
+def bias_metric_pipeline(file_path, speaking_style, custom_features, asr_performance_data: AsrPerformanceData, 
+                         excluded_features=[]):
 
     # define different color palettes to avoid confusion
     cluster_colors = sns.color_palette("colorblind", 10)[5:]
@@ -46,11 +66,6 @@ def bias_metric_pipeline(file_path, speaking_style, custom_features, excluded_fe
     # Show boxplots of clusters
     cluster_visualizer.show_grouping_boxplots()
 
-    # Prepare ASR performance data
-    # Right now these assume WER
-    filepath_manager = FilepathManager('python\config\config.json')
-    asr_performance_data = AsrPerformanceData(filepath_manager=filepath_manager, speaking_style_id=speaking_style)
-
     # Instantiate class where extracted features and ASR performance are merged
     clustering_performance = GroupingPerformance(clustering, asr_performance_data)
 
@@ -62,13 +77,8 @@ def bias_metric_pipeline(file_path, speaking_style, custom_features, excluded_fe
     print(clustering_performance.get_group_counts_comparison("Cluster", "Group"))
     print(clustering_performance.get_group_counts_comparison("Group", "Cluster"))
 
-    # Group by demographic information    
-    numeric_cols = clustering_performance.get_data().select_dtypes(include='float').columns
-    agg_dict = {col: 'mean' for col in numeric_cols}
-    agg_dict['Cluster'] = 'first'   # Cluster consistent within speaker 
-    agg_dict['Group'] = 'first'     # Group consistent within speaker 
-    combined_data_by_speaker = clustering_performance.get_data().groupby('Filename').agg(agg_dict)
-    demographic_groups = combined_data_by_speaker['Group'].tolist()
+    # Look up the demographic group of each speaker, in the same order as the extracted features
+    demographic_groups = speaker_group_map(asr_performance_data).reindex(data_prep.get_audiofile_ids()).tolist()
 
     # Create grouping object (similar to clustering) to visualize extracted features for demographic groups
     demographic_grouping = PredefinedGrouping(data_prep=data_prep, group_labels=demographic_groups)
@@ -122,8 +132,8 @@ def bias_metric_pipeline(file_path, speaking_style, custom_features, excluded_fe
     error_rates_per_cluster = clustering_performance.get_group_WERs('Cluster')
 
     # Print WERs per model per group/cluster
-    print(error_rates_per_group.pivot_table(values='WER', index='Group', columns='Model'))
-    print(error_rates_per_cluster.pivot_table(values='WER', index='Cluster', columns='Model'))
+    print(error_rates_per_group.groupby(['Group', 'Model'], sort=False, observed=True)['WER'].mean().unstack('Model'))
+    print(error_rates_per_cluster.groupby(['Cluster', 'Model'], sort=False, observed=True)['WER'].mean().unstack('Model'))
 
     # Instantiate Bias visualizer
     bias_visualizer = BiasVisualization(data_processor=clustering_performance)
@@ -158,8 +168,8 @@ def bias_metric_pipeline2(file_path, speaking_style, custom_features, overall_bi
     clusteringAlgorithm = AgglomerativeClustering(n_clusters=5, linkage='ward')
 
     # Apply clustering to feature vectors of extracted acoustic and prosodic features
-    clustering = Clustering(data_prep, clusteringAlgorithm)
-    if clustering.get_group_sizes()[:, 1].min() < 10:
+    clustering = Clustering(data_prep, clusteringAlgorithm, min_cluster_size=10)
+    if clustering.rejected:
         return None
 
     # Instantiate class where extracted features and ASR performance are merged
@@ -261,12 +271,21 @@ def main():
 
     custom_features_dict = {csvfield: (label, unit) for (csvfield, label, unit) in extracted_features}
 
+    # Find list of features to ignore from the input data for every feature subset
+    # Warning: any feature in the csv but not in custom_features_dict is not excluded from the clustering
+    exclusions_by_subset = [[feature for feature in custom_features_dict if feature not in feature_set] 
+                            for feature_set in map(set, feature_subsets)]
+
+    # Prepare ASR performance data once per speaking style, it is shared by all feature subsets
+    # Right now these assume WER
+    filepath_manager = FilepathManager('python\\config\\config.json')
+    asr_by_style = {speaking_style: AsrPerformanceData(filepath_manager=filepath_manager, speaking_style_id=speaking_style)
+                    for speaking_style in speaking_styles}
+
     results = {}
 
     for i, feature_subset in enumerate(feature_subsets):
-        # Find list of features to ignore from the input data
-        # Warning: any feature in the csv but not in custom_features_dict is not excluded from the clustering
-        excluded_features = [feature for feature in custom_features_dict if feature not in feature_subset]
+        excluded_features = exclusions_by_subset[i]
 
         for speaking_style, filepath in zip(speaking_styles, feature_vectors_filepaths):
             print(f"#### {speaking_style} {feature_subset} ####")
@@ -274,6 +293,7 @@ def main():
             error_rates_per_group, error_rates_per_cluster = bias_metric_pipeline(file_path=filepath, 
                                 speaking_style=speaking_style,
                                 custom_features=custom_features_dict, 
+                                asr_performance_data=asr_by_style[speaking_style],
                                 excluded_features=excluded_features)
             
             # Add demographic groups bias as baseline
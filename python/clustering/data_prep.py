@@ -1,6 +1,79 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from scipy.stats import shapiro
-from sklearn.preprocessing import MinMaxScaler
+from sklearn.base import clone
+from sklearn.preprocessing import MaxAbsScaler, MinMaxScaler, RobustScaler, StandardScaler
+
+from python.utils import CSV_ENGINE
+
+# Normalized feature matrices per (file path, scaler configuration), see `_normalize_prepped`
+_normalized_cache = {}
+
+# Scalers that scale each feature independently, so a feature subset can be selected from their cached result
+_COLUMNWISE_SCALERS = (MaxAbsScaler, MinMaxScaler, RobustScaler, StandardScaler)
+
+@lru_cache(maxsize=None)
+def _load_prepped(file_path):
+    """Read the extracted speech features from .csv and engineer the temporal features. The result is cached 
+    per file, so that DataPrep objects for different feature subsets of the same file share a single read. 
+    It should therefore never be modified in place.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .csv file of extracted speech features
+
+    Returns
+    -------
+    DataFrame
+        Extracted acoustic and prosodic features for every audiofile
+    """
+    data = pd.read_csv(file_path, encoding='ISO-8859-1', engine=CSV_ENGINE)
+
+    # Store the features in single precision, which halves the memory touched by the scaling and clustering
+    data = data.astype({field: np.float32 for field in data.columns[1:]})
+
+    # Engineer new temporal features. Instead of the duration of a phoneme, the duration relative to that speaker's average 
+    # phoneme duration is computed. This is hardcoded here due to time constraints.
+    duration_columns = [column for column in ('Mean Duration O (s)', 'Mean Duration E (s)', 'Mean Duration A (s)', 
+                                              'Mean Duration u (s)', 'Mean Duration @ (s)') if column in data.columns]
+    if duration_columns:
+        articulation_rate = data['Mean Articulation Rate (phpm)'].to_numpy()[:, np.newaxis]
+        data[duration_columns] = data[duration_columns].to_numpy() * articulation_rate * (1.0 / 60.0)
+
+    # Index the audiofiles by their identifier, so that lookups and alignments by 'Filename' use a prebuilt hash index.
+    # The index is left unnamed to keep 'Filename' an unambiguous column for merges and groupbys
+    return data.set_index('Filename', drop=False).rename_axis(None)
+
+def _normalize_prepped(file_path, scaler):
+    """Fit a copy of the scaler on all extracted speech features of a .csv file and cache the result. Since 
+    the `_COLUMNWISE_SCALERS` scale each feature independently, the normalized data of any feature subset 
+    is a column selection of this matrix. Other scalers must not be passed here.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .csv file of extracted speech features
+    scaler : sklearn.preprocessing Scaler object
+        The scaler to apply to the data
+
+    Returns
+    -------
+    ndarray
+        The normalized data of all features
+    dict[str, int]
+        The column index of each feature in the normalized data
+    """
+    # Key on the full parameters, since the repr of sklearn estimators abbreviates long parameter values
+    key = (file_path, type(scaler), repr(sorted(scaler.get_params().items())))
+    if key not in _normalized_cache:
+        data = _load_prepped(file_path)
+        feature_fields = data.columns[1:]
+        normalized_data = clone(scaler).fit_transform(data[feature_fields].to_numpy(dtype=np.float32))
+        _normalized_cache[key] = (normalized_data, {field: i for i, field in enumerate(feature_fields)})
+    return _normalized_cache[key]
 
 class DataPrep:
     """
@@ -10,15 +83,17 @@ class DataPrep:
     ----------
     speaking_style : str
         Name of the speaking style used in the speech that was extracted from
+    file_path : str
+        Path to the .csv file of extracted speech features
     data : DataFrame
-        Extracted acoustic and prosodic features for every audiofile   
+        Extracted acoustic and prosodic features for every audiofile, indexed by the audiofile identifiers
     audiofile_ids : list
         Identifiers of the audiofiles
     custom_features : dict[str, tuple[str, str]]
         Dictionary where each key is a string that matches the field names of the .csv file found at file_path,
         and each value is a tuple containing the custom fieldname for plots and the unit of measurement
-    normalized_data : DataFrame
-        Version of the data after a scaler has been applied. None if `normalize_data` has not yet been called.
+    normalized_data : ndarray
+        Version of the data after a scaler has been applied, as a float32 array. None if `normalize_data` has not yet been called.
     """
     def __init__(self, file_path, speaking_style, feature_dict=None, dropcolumns=[]):
         """Inits DataPrep.
@@ -39,24 +114,10 @@ class DataPrep:
         """  
         self.speaking_style = speaking_style
 
-        self.data = pd.read_csv(file_path, encoding='ISO-8859-1')
-
-        # Engineer new temporal features. Instead of the duration of a phoneme, the duration relative to that speaker's average 
-        # phoneme duration is computed. This is hardcoded here due to time constraints.
-        columnlist = self.data.columns.tolist()
-        if 'Mean Duration O (s)' in columnlist:
-            self.data['Mean Duration O (s)'] = self.data['Mean Duration O (s)'] * self.data['Mean Articulation Rate (phpm)'] / 60
-        if 'Mean Duration E (s)' in columnlist:
-            self.data['Mean Duration E (s)'] = self.data['Mean Duration E (s)'] * self.data['Mean Articulation Rate (phpm)'] / 60
-        if 'Mean Duration A (s)' in columnlist:
-            self.data['Mean Duration A (s)'] = self.data['Mean Duration A (s)'] * self.data['Mean Articulation Rate (phpm)'] / 60
-        if 'Mean Duration u (s)' in columnlist:
-            self.data['Mean Duration u (s)'] = self.data['Mean Duration u (s)'] * self.data['Mean Articulation Rate (phpm)'] / 60
-        if 'Mean Duration @ (s)' in columnlist:
-            self.data['Mean Duration @ (s)'] = self.data['Mean Duration @ (s)'] * self.data['Mean Articulation Rate (phpm)'] / 60
-
-        # Drop columns to allow subsets of the extracted features
-        self.data.drop(columns=dropcolumns, inplace=True, errors='ignore') 
+        self.file_path = file_path
+
+        # Drop columns to allow subsets of the extracted features (the shared, cached data itself is left untouched)
+        self.data = _load_prepped(file_path).drop(columns=dropcolumns, errors='ignore')
 
         self.audiofile_ids = self.data['Filename'] # actually recording IDs, but I treat it as speaker
         
@@ -64,11 +125,10 @@ class DataPrep:
 
         self.custom_features = {csvfield: (csvfield, "Value") for csvfield in csv_feature_fields}
         
-        for csvfield in feature_dict:
-            if csvfield in self.custom_features:
-                self.custom_features[csvfield] = feature_dict[csvfield]
-            # else:
-                # print(f"{csvfield} is not one of the extracted features.")
+        # Fields of feature_dict that are not one of the extracted features are ignored
+        if feature_dict:
+            self.custom_features.update({csvfield: custom_feature for csvfield, custom_feature in feature_dict.items() 
+                                         if csvfield in self.custom_features})
 
         self.normalized_data = None
     
@@ -87,19 +147,17 @@ class DataPrep:
         DataFrame
             The Shapiro-Wilk Statistic and p-value of each feature
         """        
-        results = []
-
-        for column in self.data[feature_columns]:
-            stat, p_value = shapiro(self.data[column])
-            is_normal = p_value >= threshold
-            results.append({
-                'Feature': column,
-                'Shapiro-Wilk Statistic': stat,
-                'p-value': p_value,
-                'Normality': is_normal
-            })
-
-        return pd.DataFrame(results).set_index('Feature')
+        feature_columns = list(feature_columns)
+        features = self.data[feature_columns].to_numpy()
+
+        stats, p_values = zip(*[shapiro(features[:, i]) for i in range(features.shape[1])])
+
+        return pd.DataFrame({
+            'Feature': feature_columns,
+            'Shapiro-Wilk Statistic': stats,
+            'p-value': p_values,
+            'Normality': np.asarray(p_values) >= threshold
+        }).set_index('Feature')
       
     def normalize_data(self, scaler, check_normality=False):
         """Normalize the data and save the result in the class attribute `normalized_data`.
@@ -107,7 +165,9 @@ class DataPrep:
         Parameters
         ----------
         scaler : sklearn.preprocessing Scaler object
-            The scaler to apply to the data
+            The scaler to apply to the data. For MaxAbsScaler, MinMaxScaler, RobustScaler and StandardScaler it 
+            only serves as a template: a copy of it is fitted once per file and cached, and the scaler itself is 
+            not fitted. Any other scaler is fitted on the features of this DataPrep
         check_normality : bool, optional
             When True, checks and prints whether all features are normally distributed. By default False
         """        
@@ -119,7 +179,15 @@ class DataPrep:
             print(f"{'Not all' if isNotNormal else 'All'} features are normally distributed.")
             print(shapiroWilk)
 
-        self.normalized_data = scaler.fit_transform(self.data[feature_columns])
+        if type(scaler) in _COLUMNWISE_SCALERS:
+            # The scaler is fitted once per file on all features; select the columns of this feature subset
+            normalized_data, column_indices = _normalize_prepped(self.file_path, scaler)
+            normalized_data = normalized_data[:, [column_indices[column] for column in feature_columns]]
+        else:
+            normalized_data = scaler.fit_transform(self.data[list(feature_columns)].to_numpy(dtype=np.float32))
+
+        # Single precision and C-contiguous, so that the clustering does not need to copy or convert the data
+        self.normalized_data = np.ascontiguousarray(normalized_data, dtype=np.float32)
 
     def get_audiofile_ids(self):
         """Get the identifiers of the audiofiles found in the .csv at `filepath`.
@@ -1,4 +1,8 @@
 import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+from sklearn.cluster import AgglomerativeClustering
+
 from python.clustering.data_prep import DataPrep
 
 class Grouping:
@@ -14,7 +18,7 @@ class Grouping:
     group_labels : list of str
         List containing the speaker group for every speaker in the DataPrep
     data_with_group_labels : DataFrame
-        The data with the group column added to it
+        The data with the group column added to it. None until `get_data_with_group_labels` is first called
     """    
     def __init__(self, data_prep: DataPrep, label_fieldname):
         """Init Grouping.
@@ -33,18 +37,24 @@ class Grouping:
 
     def _add_labels(self):
         """
-        Add the column with the assinged speaker group name for each speaker.
+        Add the column with the assinged speaker group name for each speaker. The data with the group column is 
+        only built once it is requested with `get_data_with_group_labels()`, so this resets it.
         """
-        self.data_with_group_labels = self.data_prep.data.assign(**{self.label_fieldname: self.group_labels})
+        self.data_with_group_labels = None
 
     def get_data_with_group_labels(self):
-        """Get the data with the column that assigns a speaker group to each speaker.
+        """Get the data with the column that assigns a speaker group to each speaker. If it was not yet built, 
+        do that first. The feature columns are shared with `data_prep.data` (shallow copy) rather than copied, 
+        so writes into them would also change `data_prep.data`: the result should never be modified in place.
 
         Returns
         -------
         DataFrame
             The data with the group column added to it
         """        
+        if self.data_with_group_labels is None:
+            self.data_with_group_labels = self.data_prep.data.copy(deep=False)
+            self.data_with_group_labels[self.label_fieldname] = self.group_labels
         return self.data_with_group_labels
     
     def get_group_labels(self):
@@ -72,19 +82,34 @@ class Grouping:
 
         Returns
         -------
-        ndarray
-            Array of length 2 arrays holding the speaker group (which can be a cluster) name and size
+        recarray
+            Record array with fields 'label' and 'count', holding the speaker group (which can be a cluster) 
+            name and size
         """        
-        unique, counts = np.unique(self.group_labels, return_counts=True)
-        return np.asarray((unique, counts)).T
+        group_labels = np.asarray(self.group_labels)
+        if np.issubdtype(group_labels.dtype, np.integer) and (len(group_labels) == 0 or group_labels.min() >= 0):
+            # Cluster labels are small non-negative integers, so they can be counted without sorting
+            counts = np.bincount(group_labels)
+            unique = np.nonzero(counts)[0]
+            counts = counts[unique]
+        else:
+            # Sort the (few) group names, so that the sizes are listed in the same order as np.unique would give
+            value_counts = pd.Series(group_labels).value_counts(sort=False).sort_index()
+            unique, counts = value_counts.index.to_numpy(), value_counts.to_numpy()
+        return np.rec.fromarrays([unique, counts], names='label,count')
     
 class Clustering(Grouping):
     """
         Class representing a Grouping of a DataPrep by performing clustering on its data.
 
         Inherits methods from Grouping.
+
+    Attributes
+    ----------
+    rejected : bool
+        True if a minimum cluster size was given and at least one of the clusters is smaller than that
     """
-    def __init__(self, data_prep: DataPrep, clusteringAlgorithm):
+    def __init__(self, data_prep: DataPrep, clusteringAlgorithm, min_cluster_size=None):
         """Inits Clustering by applying the clustering algorithm to the extracted features and adding the resulting cluster assignments using `_add_labels()`.
 
         Parameters
@@ -92,13 +117,51 @@ class Clustering(Grouping):
         data_prep : DataPrep
             The extracted audio features as a DataPrep object
         clusteringAlgorithm : sklearn.cluster object
-            The clustering algorithm to apply
+            The clustering algorithm to apply. An AgglomerativeClustering with a fixed number of clusters and no 
+            connectivity constraints is usually computed with SciPy instead (see `_fit_predict`), in which case it 
+            only serves as a configuration: it is not fitted, so attributes such as `labels_` and `children_` are 
+            not set
+        min_cluster_size : int, optional
+            The minimum number of speakers per cluster. If any cluster is smaller, the clustering is `rejected`. 
+            By default None (no minimum)
         """        
         super().__init__(data_prep=data_prep, label_fieldname='Cluster')
-        model = clusteringAlgorithm
-        self.group_labels = model.fit_predict(self.data_prep.get_normalized_data())
+        self.group_labels = self._fit_predict(clusteringAlgorithm, self.data_prep.get_normalized_data())
+        self.rejected = min_cluster_size is not None and self.get_group_sizes()['count'].min() < min_cluster_size
         self._add_labels()
 
+    @staticmethod
+    def _fit_predict(clusteringAlgorithm, X):
+        """Apply the clustering algorithm to the feature vectors. Agglomerative clustering into a fixed number 
+        of clusters without connectivity constraints is computed with SciPy, which builds and cuts the same hierarchy 
+        considerably faster than sklearn. The clusters are numbered differently than sklearn would number them. If 
+        tied merge heights keep SciPy from cutting the hierarchy into exactly `n_clusters` clusters, sklearn is used.
+
+        Parameters
+        ----------
+        clusteringAlgorithm : sklearn.cluster object
+            The clustering algorithm to apply
+        X : ndarray
+            The feature vectors to cluster
+
+        Returns
+        -------
+        ndarray
+            The assigned cluster (0 to n_clusters - 1) of each feature vector
+        """
+        if (isinstance(clusteringAlgorithm, AgglomerativeClustering) and clusteringAlgorithm.n_clusters is not None
+                and clusteringAlgorithm.connectivity is None
+                and getattr(clusteringAlgorithm, 'metric', None) in (None, 'euclidean', 'deprecated')):
+            # For ward, complete and average linkage SciPy runs the nearest-neighbour chain algorithm with 
+            # Lance-Williams distance updates in compiled code, so no hand-written kernel is needed here
+            Z = linkage(X, method=clusteringAlgorithm.linkage)
+            labels = fcluster(Z, t=clusteringAlgorithm.n_clusters, criterion='maxclust') - 1
+
+            # fcluster cannot split merges of equal height, so it may return fewer clusters than requested
+            if len(np.unique(labels)) == clusteringAlgorithm.n_clusters:
+                return labels
+        return clusteringAlgorithm.fit_predict(X)
+
     def _add_labels(self):
         """Add the column containing assigned group names.
         """        
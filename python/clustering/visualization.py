@@ -7,6 +7,31 @@ from python.clustering.grouping import Grouping
 from python.clustering.data_prep import DataPrep
 from python.utils import format_label_unit
 
+def _fast_corr(data):
+    """Compute the Pearson correlation coefficient between every pair of numeric columns with a single 
+    matrix product. Rows with missing values are left out.
+
+    Parameters
+    ----------
+    data : DataFrame
+        The data to correlate the numeric columns of
+
+    Returns
+    -------
+    DataFrame
+        The correlation matrix of the numeric columns
+    """
+    numeric_data = data.select_dtypes('number')
+    X = numeric_data.to_numpy(dtype=np.float64)
+    X = X[np.isfinite(X).all(axis=1)]
+
+    centered = X - X.mean(axis=0)
+    norms = np.linalg.norm(centered, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (centered.T @ centered) / np.outer(norms, norms)
+
+    return pd.DataFrame(np.clip(corr, -1, 1), index=numeric_data.columns, columns=numeric_data.columns)
+
 class DataVisualization:
     """
     Class for the visualization of a DataPrep object.
@@ -29,25 +54,39 @@ class DataVisualization:
     def correlation_matrix(self):
         """Plot a triangular matrix of each Pearson correlation coefficient between pairs of speech features. 
         """        
-        corr = self.data_prep.data.corr(numeric_only=True)
+        corr = _fast_corr(self.data_prep.data)
 
         # Don't show it if it's going to be empty anyway
         if corr.shape == (1, 1):
             return
 
-        ticklabels = [custom_label for (field_label, (custom_label, unit)) in self.data_prep.get_custom_features().items()]
+        ticklabels = [custom_label for (custom_label, unit) in self.data_prep.get_custom_features().values()]
 
         # Create a mask for the upper triangle
         mask = np.triu(np.ones_like(corr, dtype=bool))
 
-        sns.heatmap(corr, vmin=-1, vmax=1, center=0, cmap="coolwarm", 
-                    annot=True, xticklabels=ticklabels, yticklabels=ticklabels, mask=mask)
+        fig, ax = plt.subplots()
+        if corr.shape[0] > 15:
+            # Annotating every cell is slow for large matrices, so only label the noteworthy correlations
+            values = corr.to_numpy()
+            im = ax.imshow(np.ma.masked_array(values, mask=mask), cmap="coolwarm", vmin=-1, vmax=1, aspect='auto')
+            fig.colorbar(im, ax=ax)
+            for i, j in zip(*np.nonzero(~mask & (np.abs(values) > 0.3))):
+                ax.text(j, i, f"{values[i, j]:.2f}", ha='center', va='center', fontsize='x-small')
+            ax.set_xticks(range(len(ticklabels)), ticklabels, rotation=90)
+            ax.set_yticks(range(len(ticklabels)), ticklabels)
+            # Cell centers are at integer positions, so shift the limits by half a cell
+            xlim, ylim = (-0.5, corr.shape[0]-1.5), (corr.shape[1]-0.5, 0.5)
+        else:
+            sns.heatmap(corr, vmin=-1, vmax=1, center=0, cmap="coolwarm", 
+                        annot=True, xticklabels=ticklabels, yticklabels=ticklabels, mask=mask, rasterized=True, ax=ax)
+            xlim, ylim = (0, corr.shape[0]-1), (corr.shape[1], 1)
         plt.title(f"Correlation between Features ({self.data_prep.get_speaking_style()})")
-        plt.tight_layout()
         plt.subplots_adjust(top=0.922, bottom=0.224, left=0.168, right=0.977, hspace=0.2, wspace=0.2)
-        plt.xlim(0, corr.shape[0]-1)
-        plt.ylim(corr.shape[1], 1)
+        plt.xlim(*xlim)
+        plt.ylim(*ylim)
         plt.show()
+        plt.close(fig)
 
 class GroupingVisualization:
     """
@@ -64,7 +103,7 @@ class GroupingVisualization:
     """    
     def __init__(self, grouping: Grouping, 
                  markers=['o', 'v', 's', 'D', 'p'], 
-                 palette=sns.color_palette("colorblind", 5)):
+                 palette=None):
         """Inits GroupingVisualization.
  
         Parameters
@@ -76,11 +115,11 @@ class GroupingVisualization:
             By default ['o', 'v', 's', 'D', 'p']
         palette : _RGBColorPalette, optional
             A list of colors for the speaker groups to consistently use accross plots in this GroupingVisualization. 
-            By default sns.color_palette("colorblind", 5)
+            By default None, which uses sns.color_palette("colorblind", 5)
         """        
         self.grouping = grouping
         self.markers = markers
-        self.palette = palette
+        self.palette = palette if palette is not None else sns.color_palette("colorblind", 5)
 
     def show_grouping_2d(self, x_feature, y_feature):
         """Plot 2d scatterplot of the Grouping.
@@ -96,32 +135,27 @@ class GroupingVisualization:
 
         custom_features = self.grouping.data_prep.get_custom_features()
 
-        # Plot the grouped data
-        plt.figure(figsize=(6, 6))
-
-        if x_feature not in self.grouping.data_prep.get_custom_features().keys():
-            print(f"x-axis cannot be {x_feature} because {x_feature} is not part of the feature space")
-            x_feature=np.zeros(len(self.grouping.data_prep.data))
-            x_label = tuple(["Nothing","Cricket Noises per Second"])
-        else:
-            x_label = custom_features[x_feature]
+        x_label = custom_features.get(x_feature)
+        y_label = custom_features.get(y_feature)
+        if x_label is None or y_label is None:
+            invalid = [feature for feature, label in ((x_feature, x_label), (y_feature, y_label)) if label is None]
+            print(f"Cannot plot {', '.join(invalid)} because it is not part of the feature space")
+            return
 
-        if y_feature not in self.grouping.data_prep.get_custom_features().keys():
-            print(f"y-axis cannot be {y_feature} because {y_feature} is not part of the feature space")
-            y_feature=np.zeros(len(self.grouping.data_prep.data))
-            y_label = tuple(["Nothing","Cricket Noises per Second"])
-        else:
-            y_label = custom_features[y_feature]
+        # Plot the grouped data
+        fig, ax = plt.subplots(figsize=(6, 6))
 
         # Scatter plot of the data points with chosen colors and markers
         sns.scatterplot(data=self.grouping.get_data_with_group_labels(), x=x_feature, y=y_feature, 
-                        hue=label_fieldname, style=label_fieldname, palette=self.palette, markers=self.markers, edgecolor="k")
+                        hue=label_fieldname, style=label_fieldname, palette=self.palette, markers=self.markers, edgecolor="k",
+                        rasterized=True, ax=ax)
 
         plt.title(f"{self.grouping.label_fieldname}s ({self.grouping.data_prep.get_speaking_style()})")
         plt.xlabel(format_label_unit(x_label))
         plt.ylabel(format_label_unit(y_label))
         plt.legend()
         plt.show()
+        plt.close(fig)
 
     def show_grouping_boxplots(self):
         """Plot boxplots to visualize key characteristics of speaker groups. 
@@ -129,9 +163,7 @@ class GroupingVisualization:
         """        
         label_fieldname = self.grouping.get_label_fieldname()
 
-        # Melt the DataFrame to long format
-        data_melted = pd.melt(self.grouping.get_data_with_group_labels(), id_vars=['Filename', label_fieldname], 
-                            var_name='Feature', value_name='Value')
+        data_with_group_labels = self.grouping.get_data_with_group_labels()
 
         # Get original and custom feature names
         custom_features = self.grouping.data_prep.get_custom_features()
@@ -147,7 +179,7 @@ class GroupingVisualization:
             
         # Create a boxplot for each feature
         for i, feature in enumerate(custom_features):
-            sns.boxplot(data=data_melted[data_melted['Feature'] == feature], x=label_fieldname, y='Value',
+            sns.boxplot(data=data_with_group_labels, x=label_fieldname, y=feature,
                         hue=label_fieldname, palette=self.palette, legend=False, ax=axes[i])
             axes[i].set_title(custom_features[feature][0])
             axes[i].set_xlabel(label_fieldname)
@@ -161,3 +193,4 @@ class GroupingVisualization:
         #plt.subplots_adjust(top=0.88, bottom=0.197, left=0.046, right=0.99, hspace=0.2, wspace=0.605)
         #plt.subplots_adjust(top=0.88, bottom=0.197, left=0.136, right=0.99, hspace=0.2, wspace=0.605)
         plt.show()
+        plt.close(fig)
@@ -2,6 +2,31 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+def _describe_columns(values):
+    """Compute the mean, standard deviation, minimum, maximum and median of every column, ignoring NaNs. 
+    The columns are sorted once, after which the minimum, maximum and median are read from the sorted values.
+
+    Parameters
+    ----------
+    values : ndarray
+        2D array of which to describe the columns
+
+    Returns
+    -------
+    ndarray
+        Array of shape (5, number of columns) holding the mean, standard deviation, minimum, maximum and median
+    """
+    # NaNs are sorted to the end of each column
+    sorted_values = np.sort(values, axis=0)
+    counts = np.count_nonzero(~np.isnan(sorted_values), axis=0)
+    columns = np.arange(values.shape[1])
+
+    mins = sorted_values[0]
+    maxs = sorted_values[np.maximum(counts - 1, 0), columns]
+    medians = (sorted_values[np.maximum((counts - 1) // 2, 0), columns] + sorted_values[counts // 2, columns]) / 2
+
+    return np.stack([np.nanmean(values, axis=0), np.nanstd(values, axis=0, ddof=1), mins, maxs, medians])
+
 class SubsetsVisualization:
     """
     Class for visual comparison of the ASR performance when clustering on different feature sets.
@@ -11,15 +36,15 @@ class SubsetsVisualization:
     palette : _RGBColorPalette
         (still unused) Colors used for the different ASR models
     """    
-    def __init__(self, palette=sns.color_palette("colorblind", 5)):
+    def __init__(self, palette=None):
         """Init SubsetsVisualization.
 
         Parameters
         ----------
         palette : _RGBColorPalette, optional
-            Colors to use for the different ASR models, by default sns.color_palette("colorblind", 5)
+            Colors to use for the different ASR models, by default None, which uses sns.color_palette("colorblind", 5)
         """        
-        self.palette = palette # TODO implement colors per ASR model
+        self.palette = palette if palette is not None else sns.color_palette("colorblind", 5) # TODO implement colors per ASR model
     
     def plot_error_description_per_feature_subset(self, results):
         """Plot the Min, Max, Mean ± SD, and Median speaker group Word Error Rate 
@@ -34,7 +59,7 @@ class SubsetsVisualization:
         num_speaking_styles = len(np.unique([style for _, style in results.keys()]))
         num_solutions = len(results) // num_speaking_styles
 
-        fig, axes = plt.subplots(num_speaking_styles, num_solutions, figsize=(2 * num_solutions, 3 * num_speaking_styles), sharey="row")
+        fig, axes = plt.subplots(num_speaking_styles, num_solutions, figsize=(2 * num_solutions, 3 * num_speaking_styles), sharey="row", layout='constrained')
     
         # Robust against single row/column
         if num_speaking_styles == 1:
@@ -43,7 +68,9 @@ class SubsetsVisualization:
             axes = np.expand_dims(axes, axis=1)
 
         # Ensure solutions are in a consistent order
-        sorted_results = sorted(results, key=lambda x: (-ord(x[1][0]), x[0]))
+        items = list(results.keys())
+        sort_keys = [(-ord(speaking_style[0]), solution) for solution, speaking_style in items]
+        sorted_results = [items[i] for i in sorted(range(len(items)), key=sort_keys.__getitem__)]
         
         # TODO set color per model
         for i, (solution, speaking_style) in enumerate(sorted_results):
@@ -51,17 +78,10 @@ class SubsetsVisualization:
             col = i % num_solutions
             ax = axes[row, col]
 
-            label_fieldname = results[(solution, speaking_style)].index.names[1]
-            model_performance_per_group = results[(solution, speaking_style)].pivot_table(values='WER', index=label_fieldname, columns='Model')
+            model_performance_per_group = results[(solution, speaking_style)]['WER'].unstack('Model')
 
             models = model_performance_per_group.columns
-            description = model_performance_per_group.describe().loc[["mean", "std", "min", "max", "50%"]]
-
-            means = description.loc['mean']
-            stds = description.loc['std']
-            mins = description.loc['min']
-            maxs = description.loc['max']
-            medians = description.loc['50%']
+            means, stds, mins, maxs, medians = _describe_columns(model_performance_per_group.to_numpy(dtype=np.float64))
             xticks = np.arange(len(model_performance_per_group))
 
             ax.errorbar(xticks, means, yerr=stds, fmt='o', label='Mean ± Std', capsize=6)
@@ -80,6 +100,6 @@ class SubsetsVisualization:
         for i in range(num_speaking_styles):
             axes[i, 0].set_ylabel('Word Error Rate')
         plt.suptitle(f'Statistics per ASR Model per Feature Subset')
-        plt.tight_layout()
         plt.legend()
         plt.show()
+        plt.close(fig)
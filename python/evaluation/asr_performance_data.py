@@ -1,5 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from python.evaluation.filepaths import FilepathManager
+from python.utils import CSV_ENGINE
+
+# Columns read from the recognition output files, and their types (word and error counts)
+ERROR_COLUMNS = ['SPKR', '# Wrd', 'Sub', 'Del', 'Ins']
+ERROR_DTYPES = {'# Wrd': 'int32', 'Sub': 'int32', 'Del': 'int32', 'Ins': 'int32'}
+
+@lru_cache(maxsize=None)
+def _read_meta_file(filepath):
+    """Read a metadata file. The result is cached per file, so it should never be modified in place.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the metadata .csv file
+
+    Returns
+    -------
+    DataFrame
+        The metadata of every speaker
+    """
+    return pd.read_csv(filepath, engine=CSV_ENGINE)
+
+@lru_cache(maxsize=256)
+def _read_error_file(filepath):
+    """Read the word and error counts per speaker from a recognition output file. The result is cached 
+    per file, so it should never be modified in place.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the recognition output .csv file
+
+    Returns
+    -------
+    DataFrame
+        The `ERROR_COLUMNS` of the file
+    """
+    return pd.read_csv(filepath, usecols=ERROR_COLUMNS, dtype=ERROR_DTYPES, engine=CSV_ENGINE)
 
 class AsrPerformanceData:
     """
@@ -43,12 +85,12 @@ class AsrPerformanceData:
         This is because in practice, speaker groups would be unknown.  
         
         The resulting dataframe contains the following columns:
-            - 'SPKR' : The ID of the speaker
+            - 'SPKR' : The ID of the speaker (categorical)
             - '# Wrd' : The total word count of the speaker
             - 'Sub' : The number of substitutions of the speaker
             - 'Del' : The number of deletions of the speaker
             - 'Ins' : The number of insertions of the speaker
-            - 'Model' : The name of the ASR model 
+            - 'Model' : The name of the ASR model (categorical)
 
         Parameters
         ----------
@@ -64,26 +106,35 @@ class AsrPerformanceData:
         meta_filepath = self.filepath_manager.get_meta_path(speaking_style_id=self.speaking_style_id)
 
         # Create DataFrame from metadata .csv file
-        meta_data = pd.read_csv(meta_filepath)
+        meta_data = _read_meta_file(meta_filepath)
         
         # Get names of speaker groups and ASR models
         speaker_groups = self.filepath_manager.get_speaker_groups()
         asr_models = self.filepath_manager.get_asr_models()
 
-        # Initialize a list to hold all model_error_data dataframes
-        all_model_error_data = []    
+        # The categories are sorted, so that model-indexed results keep the alphabetical order of the model names
+        model_categories = sorted(asr_models)
+
+        # List the recognition output file of every speaker group and ASR model, with the category code of the ASR model
+        model_error_filepaths = self.filepath_manager.get_error_rate_paths(speaking_style_id=self.speaking_style_id)
+        model_codes = np.tile([model_categories.index(model) for model in asr_models], len(speaker_groups))
 
-        for group in speaker_groups:
-            for model in asr_models:
-                model_error_filepath = self.filepath_manager.get_error_rate_path(speaking_style_id=self.speaking_style_id,
-                                                                speaker_group=group, asr_model=model)
-            
-                model_error_data = pd.read_csv(model_error_filepath)[['SPKR', '# Wrd', 'Sub', 'Del', 'Ins']]
-                model_error_data['Model'] = model  # Add model identifier
-                all_model_error_data.append(model_error_data)
+        # Reading the files is I/O-bound and the parser releases the GIL, so the files are read in parallel threads
+        with ThreadPoolExecutor(max_workers=min(16, len(model_error_filepaths))) as executor:
+            all_model_error_data = list(executor.map(_read_error_file, model_error_filepaths))
 
         combined_model_error_data = pd.concat(all_model_error_data, ignore_index=True)
-        df = pd.merge(meta_data, combined_model_error_data, on='SPKR', how='inner')
+
+        # Add model identifier as a categorical column, built at once from the model index of every file
+        lengths = [len(model_error_data) for model_error_data in all_model_error_data]
+        combined_model_error_data['Model'] = pd.Categorical.from_codes(np.repeat(model_codes, lengths), categories=model_categories)
+
+        # Join on a categorical speaker ID with shared categories, so the join key is hashed as integer codes
+        speaker_dtype = pd.CategoricalDtype(categories=meta_data['SPKR'].unique())
+        meta_data = meta_data.astype({'SPKR': speaker_dtype})
+        combined_model_error_data['SPKR'] = combined_model_error_data['SPKR'].astype(speaker_dtype)
+
+        df = meta_data.set_index('SPKR').join(combined_model_error_data.set_index('SPKR'), how='inner').reset_index()
         return df
     
     def get_data(self):
@@ -96,6 +147,17 @@ class AsrPerformanceData:
         """        
         return self.data
     
+    def get_meta_data(self):
+        """Get the metadata of every speaker of the speaking style. The metadata is read once per file and 
+        shared, so it should never be modified in place.
+
+        Returns
+        -------
+        DataFrame
+            The metadata of every speaker
+        """        
+        return _read_meta_file(self.filepath_manager.get_meta_path(speaking_style_id=self.speaking_style_id))
+
     def get_speaking_style(self):
         """Get the ID of the speaking style.
 
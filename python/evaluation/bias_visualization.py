@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -10,7 +11,7 @@ class BiasVisualization:
     """    
     def __init__(self, data_processor: GroupingPerformance,
                  markers=['o', 'v', 's', 'D', 'p'], 
-                 palette=sns.color_palette("colorblind", 5)):
+                 palette=None):
         """Inits BiasVisualization.
 
         Parameters
@@ -20,11 +21,11 @@ class BiasVisualization:
         markers : list, optional
             (still unused), by default ['o', 'v', 's', 'D', 'p']
         palette : _RGBColorPalette, optional
-            (still unused), by default sns.color_palette("colorblind", 5)
+            (still unused), by default None, which uses sns.color_palette("colorblind", 5)
         """        
         self.data_processor = data_processor
         self.markers = markers
-        self.palette = palette
+        self.palette = palette if palette is not None else sns.color_palette("colorblind", 5)
 
     def correlation_features_errors(self):
         """Plot the Pearson correlation coefficients of every pair of a speech feature and an ASR model's performance.
@@ -37,18 +38,30 @@ class BiasVisualization:
         speaking_style = self.data_processor.asr_performance.get_speaking_style()
 
         features_wer = self.data_processor.get_wer_per_speaker()
-        pivot_df = features_wer.pivot_table(index=feature_columns, columns='Model', values='Speaker Bias').reset_index()
-        corr = pivot_df.corr(numeric_only=True)[model_columns].loc[feature_columns]
+        # Every speaker has one WER per model, so the speakers' rows can be reshaped without aggregating
+        pivot_df = features_wer.set_index(['Filename', *feature_columns, 'Model'])['Speaker Bias'].unstack('Model').reset_index()
+
+        # Only the feature-model block of the correlation matrix is needed, so compute just that block 
+        # from the centered feature and WER matrices (speakers with missing values are left out)
+        feature_values = pivot_df[list(feature_columns)].to_numpy(dtype=np.float64)
+        model_values = pivot_df[model_columns].to_numpy(dtype=np.float64)
+        complete = np.isfinite(feature_values).all(axis=1) & np.isfinite(model_values).all(axis=1)
+        centered_features = feature_values[complete] - feature_values[complete].mean(axis=0)
+        centered_models = model_values[complete] - model_values[complete].mean(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = (centered_features.T @ centered_models) / np.outer(np.linalg.norm(centered_features, axis=0), 
+                                                                      np.linalg.norm(centered_models, axis=0))
+        corr = pd.DataFrame(corr, index=list(feature_columns), columns=model_columns)
 
         # Plot the heatmap
-        plt.figure(figsize=(5, 5))
+        fig, ax = plt.subplots(figsize=(5, 5), layout='constrained')
         sns.heatmap(corr, vmin=-1, vmax=1, center=0, cmap="coolwarm", 
-                    annot=True, yticklabels=custom_feature_names)
+                    annot=True, yticklabels=custom_feature_names, rasterized=True, ax=ax)
         plt.title(f'Correlation between Features and ASR Performance ({speaking_style})')
         plt.xlabel('ASR models')
         plt.ylabel('Features')
-        plt.tight_layout()
         plt.show()
+        plt.close(fig)
 
     def plot_group_biases(self, label_fieldname, meta_measure: MetaMeasure):
         """Plot the bias of each speaker group.
@@ -65,10 +78,10 @@ class BiasVisualization:
         model_bias_df = self.data_processor.calculate_bias_per_group(label_fieldname=label_fieldname, meta_measure=meta_measure)
         groups = self.data_processor.get_group_labels(label_fieldname=label_fieldname)
 
-        model_bias_pivot_df = model_bias_df.pivot_table(values='Bias', index=label_fieldname, columns='Model')
+        model_bias_pivot_df = model_bias_df['Bias'].unstack('Model')
 
         num_groups = len(groups)
-        fig, axes = plt.subplots(1, num_groups, figsize=(5 * num_groups, 5), sharey=True)
+        fig, axes = plt.subplots(1, num_groups, figsize=(5 * num_groups, 5), sharey=True, layout='constrained')
         
         for ax, group in zip(axes, groups):
             sns.barplot(data=model_bias_pivot_df.loc[group], ax=ax)
@@ -78,8 +91,8 @@ class BiasVisualization:
             ax.set_ylabel(meta_measure.metric_name)
         
         plt.suptitle(f'{meta_measure.bias_measure.metric_name} per {label_fieldname} ({speaking_style})')
-        plt.tight_layout()
         plt.show()
+        plt.close(fig)
 
     def plot_error_rates(self, label_fieldname):
         """Plot the Min, Max, Mean ± SD, and Median Word Error Rate of the speakers within a group.
@@ -96,17 +109,17 @@ class BiasVisualization:
         groups = performance_per_group_description.index.unique()
         models = performance_per_group_description['Model'].unique()
 
-        fig, axes = plt.subplots(1, len(groups), figsize=(2 * len(groups), 5), sharey=True)
+        fig, axes = plt.subplots(1, len(groups), figsize=(2 * len(groups), 5), sharey=True, layout='constrained')
+        xticks = np.arange(len(models))
         
         # TODO set color per model
         for ax, group in zip(axes, groups):
             df = performance_per_group_description.loc[group]
-            means = df['mean']
-            stds = df['std']
-            mins = df['min']
-            maxs = df['max']
-            medians = df['50%']
-            xticks = np.arange(len(models))
+            means = df['mean'].to_numpy()
+            stds = df['std'].to_numpy()
+            mins = df['min'].to_numpy()
+            maxs = df['max'].to_numpy()
+            medians = df['median'].to_numpy()
             
             ax.errorbar(xticks, means, yerr=stds, fmt='o', label='Mean ± Std', capsize=6)
             ax.scatter(xticks, mins, marker='*', label='Min')
@@ -121,5 +134,5 @@ class BiasVisualization:
 
         axes[0].set_ylabel('Word Error Rate')
         plt.suptitle(f'Statistics per ASR Model per {label_fieldname} ({self.data_processor.asr_performance.get_speaking_style()})')
-        plt.tight_layout()
         plt.show()
+        plt.close(fig)
@@ -28,6 +28,8 @@ class FilepathManager:
     get_error_rate_path(speaking_style_id, speaker_group, asr_model)
         Get the path for an error rate file. If the speaking style does not exist, the first 
         existing speaking style is used
+    get_error_rate_paths(speaking_style_id)
+        Get the paths for the error rate files of every speaker group and ASR model
     get_meta_path(speaking_style_id)
         Get the path for a metadata file. If the speaking style does not exist, the first 
         existing speaking style is used
@@ -101,6 +103,13 @@ class FilepathManager:
             for entry in speaking_styles_config
         }
 
+        # The first speaking style is the fallback for unknown speaking style IDs
+        self._default_style = next(iter(self.speaking_styles_data.values()))
+
+        # Abbreviations are used in every directory and file name, so look them up directly
+        self._abbreviations = {speaking_style_id: speaking_style_data['abbreviation'] 
+                               for speaking_style_id, speaking_style_data in self.speaking_styles_data.items()}
+
     def _generate_path(self, template, **kwargs):
         """Generate a file path based on a template and keyword arguments.
 
@@ -118,6 +127,22 @@ class FilepathManager:
         """
         return template.format(base_path=self.base_path, **kwargs)
 
+    def _abbrev(self, speaking_style_id):
+        """Get the abbreviation of a speaking style, which is used in directory and file names. If the speaking 
+        style does not exist, the first existing speaking style is used.
+
+        Parameters
+        ----------
+        speaking_style_id : str
+            The speaking style ID
+
+        Returns
+        -------
+        str
+            The abbreviation of the speaking style
+        """
+        return self._abbreviations.get(speaking_style_id, self._default_style['abbreviation'])
+
     def get_error_rate_path(self, speaking_style_id, speaker_group, asr_model):
         """Get the file path for an error rate file. With the assumption that an error rate directory can be generated 
         knowing the base directory of recognition outputs, the name of the ASR model in question, the ID of the speaking 
@@ -138,16 +163,33 @@ class FilepathManager:
         str
             The file path to the error rate file
         """
-        # Get available speaking styles
-        speaking_styles_dict = self.get_speaking_styles_data()
-        
-        # If speaking style is not available, assume the first one as default 
-        speaking_style_abbreviation = speaking_styles_dict.get(speaking_style_id, speaking_styles_dict[next(iter(speaking_styles_dict))]).get('abbreviation')
+        speaking_style_abbreviation = self._abbrev(speaking_style_id)
 
         template = self.path_templates['error_rate_file']
         return self._generate_path(template, speaking_style=speaking_style_abbreviation, speaker_group=speaker_group, 
                                    asr_model=asr_model)
     
+    def get_error_rate_paths(self, speaking_style_id):
+        """Get the file paths of the error rate files of every speaker group and ASR model. The speaking style 
+        abbreviation and the template are resolved once for all paths, see `get_error_rate_path`.
+
+        Parameters
+        ----------
+        speaking_style_id : str
+            The speaking style ID
+            
+        Returns
+        -------
+        list of str
+            The file paths to the error rate files, ordered by speaker group and then by ASR model
+        """
+        template = self.path_templates['error_rate_file']
+        speaking_style_abbreviation = self._abbrev(speaking_style_id)
+
+        return [self._generate_path(template, speaking_style=speaking_style_abbreviation, 
+                                    speaker_group=speaker_group, asr_model=asr_model)
+                for speaker_group in self.speaker_groups for asr_model in self.asr_models]
+
     def get_meta_path(self, speaking_style_id):
         """Get the file path for a metadata file. With the assumption that the metadata directory can be generated 
         knowing just the base directory of recognition outputs and the ID of the speaking style in question, this 
@@ -163,11 +205,7 @@ class FilepathManager:
         str
             The file path to the metadata file
         """
-        # Get available speaking styles
-        speaking_styles_dict = self.get_speaking_styles_data()
-        
-        # If speaking style is not available, assume the first one as default 
-        speaking_style_abbreviation = speaking_styles_dict.get(speaking_style_id, speaking_styles_dict[next(iter(speaking_styles_dict))]).get('abbreviation')
+        speaking_style_abbreviation = self._abbrev(speaking_style_id)
         
         template = self.path_templates['meta_file']
         return self._generate_path(template, speaking_style=speaking_style_abbreviation)
@@ -221,10 +259,7 @@ class FilepathManager:
         dict
             Dictionary with the 'name' and 'abbreviation' of the speaking style
         """
-        # Get available speaking styles
-        speaking_styles_dict = self.get_speaking_styles_data()
-        
         # If speaking style is not available, assume the first one as default 
-        speaking_style_data = speaking_styles_dict.get(speaking_style_id, speaking_styles_dict[next(iter(speaking_styles_dict))])
+        speaking_style_data = self.get_speaking_styles_data().get(speaking_style_id, self._default_style)
 
         return speaking_style_data
@@ -1,9 +1,10 @@
+import numpy as np
 import pandas as pd 
 
 from python.evaluation.asr_performance_data import AsrPerformanceData
 from python.clustering.grouping import Grouping
 from python.evaluation.metrics import MetaMeasure
-from python.utils import word_error_rate
+from python.utils import word_error_rates
     
 class GroupingPerformance:
     """Class for merging a Grouping with an AsrPerformanceData to create the full dataframe
@@ -26,17 +27,44 @@ class GroupingPerformance:
     def merge_data(self):
         """Merge the extracted features and their assigned group labels with the ASR performance data,
         with the assumption that both DataFrames contain a column called 'Filename' with (partially)
-        matching IDs. Any leftover entries are excluded from the experiment.
+        matching IDs. Any leftover entries are excluded from the experiment. The total number of errors 
+        (substitutions, deletions and insertions) of each speaker is added as column 'Err'.
         """        
         grouping_data = self.grouping.get_data_with_group_labels()
         performance_data = self.asr_performance.get_data()
 
-        merged_data = performance_data.merge(grouping_data, on='Filename')  
+        # Nothing can match if either side is empty, so skip hashing the keys of the other side
+        if grouping_data.empty or performance_data.empty:
+            grouping_data, performance_data = grouping_data.iloc[:0], performance_data.iloc[:0]
+
+        # Every speaker has one feature vector, so join it to all of their recognition output. The grouping data is 
+        # already indexed by 'Filename' (see DataPrep), so only the performance data needs to be indexed
+        merged_data = (performance_data.set_index('Filename')
+                       .join(grouping_data.drop(columns='Filename'), how='inner', validate='many_to_one', 
+                             lsuffix='_x', rsuffix='_y')
+                       .rename_axis('Filename').reset_index())
+
+        # Store the grouping columns as categoricals, so that grouping by them works on integer codes, 
+        # and the word and error counts as int32, which is plenty for counts and halves the memory to scan
+        grouping_fieldnames = [fieldname for fieldname in ('Model', self.grouping.get_label_fieldname()) 
+                               if fieldname in merged_data.columns]
+        merged_data = merged_data.astype({**dict.fromkeys(grouping_fieldnames, 'category'), 
+                                          **dict.fromkeys(['# Wrd', 'Sub', 'Del', 'Ins'], 'int32')})
+
+        # Total number of errors per speaker, so that group WERs only need to sum two columns
+        merged_data['Err'] = (merged_data['Sub'] + merged_data['Del'] + merged_data['Ins']).astype('int32')
 
         self.merged_data = merged_data
 
+        # Results derived from the merged data are computed on first use, so reset them on every merge
+        self._wer_per_speaker = None
+        self._group_wer_cache = {}
+        self._bias_cache = {}
+        self._crosstab_cache = {}
+
     def get_group_WERs(self, label_fieldname):
-        """Calculate the WERs per group per ASR model.
+        """Calculate the WERs per group per ASR model. The result is cached per label column, so it should 
+        never be modified in place.
 
         Parameters
         ----------
@@ -48,11 +76,14 @@ class GroupingPerformance:
         DataFrame
             WERs per group per ASR model
         """        
-        grouped = self.get_data().groupby(['Model', label_fieldname]).agg('sum', numeric_only = True)
-        grouped['WER'] = grouped.apply(lambda spkr: word_error_rate(spkr['Sub'], spkr['Del'], spkr['Ins'], spkr['# Wrd']), axis=1)
-        wers_per_model_per_group = grouped[['WER']]
+        if label_fieldname not in self._group_wer_cache:
+            # Only the error and word counts are needed, so only those are summed
+            grouped = (self.get_data().groupby(['Model', label_fieldname], observed=True, sort=False)
+                       [['Err', '# Wrd']].sum().sort_index())
+            grouped['WER'] = word_error_rates(grouped['Err'], grouped['# Wrd']).astype(np.float32)
+            self._group_wer_cache[label_fieldname] = grouped[['WER']]
 
-        return wers_per_model_per_group
+        return self._group_wer_cache[label_fieldname]
 
     def calculate_bias(self, label_fieldname, meta_measure: MetaMeasure):
         """Calculate the performance of the ASR models for each speaker group given the 
@@ -70,9 +101,8 @@ class GroupingPerformance:
         DataFrame
             The performance per ASR model
         """        
-        return meta_measure.compute(self.get_group_WERs(label_fieldname))[0]
+        return self._compute_meta_measure(label_fieldname, meta_measure).overall
     
-    # TODO call the compute function once and store the result to avoid extra computational costs
     def calculate_bias_per_group(self, label_fieldname, meta_measure: MetaMeasure):
         """Calculate the WER and bias per speaker group for each ASR model, given 
         the column where speaker group labels can be found and the meta-measure to apply.
@@ -89,22 +119,50 @@ class GroupingPerformance:
         DataFrame
             The WER and the Bias per speaker group per ASR model 
         """        
-        return meta_measure.compute(self.get_group_WERs(label_fieldname))[1]
+        return self._compute_meta_measure(label_fieldname, meta_measure).per_group
+
+    def _compute_meta_measure(self, label_fieldname, meta_measure: MetaMeasure):
+        """Apply a meta-measure to the WERs per speaker group per ASR model. The result is computed 
+        once per label column and meta-measure, and shared by `calculate_bias` and `calculate_bias_per_group`.
+
+        Parameters
+        ----------
+        label_fieldname : str
+            The column that holds the assigned speaker group labels
+        meta_measure : MetaMeasure
+            The meta-measure to apply
+
+        Returns
+        -------
+        BiasResult
+            The performance per ASR model, and the WER and the Bias per speaker group per ASR model
+        """        
+        # Measures are stateless apart from their type, so measures of the same classes share a result
+        key = (label_fieldname, type(meta_measure), type(meta_measure.bias_measure))
+        if key not in self._bias_cache:
+            self._bias_cache[key] = meta_measure.compute(self.get_group_WERs(label_fieldname))
+
+        return self._bias_cache[key]
 
     def get_wer_per_speaker(self):
-        """Calculate the WER for each speaker for each ASR model.
+        """Calculate the WER for each speaker for each ASR model. The result is cached, so it should never 
+        be modified in place.
 
         Returns
         -------
         DataFrame
             WERs per speaker per ASR model
         """        
-        wer_per_speaker = self.get_data().copy()
-
-        # Calculate the WER for each speaker
-        wer_per_speaker['Speaker Bias'] = self.get_data().apply(lambda spkr: word_error_rate(spkr['Sub'], spkr['Del'], spkr['Ins'], spkr['# Wrd']), axis=1)
+        if self._wer_per_speaker is None:
+            data = self.get_data()
+
+            # Add the WER of each speaker to a shallow copy, which shares the columns of the merged data 
+            # rather than copying them (the merged data itself is not modified)
+            wer_per_speaker = data.copy(deep=False)
+            wer_per_speaker['Speaker Bias'] = word_error_rates(data['Err'], data['# Wrd']).astype(np.float32)
+            self._wer_per_speaker = wer_per_speaker
         
-        return wer_per_speaker
+        return self._wer_per_speaker
 
     def get_error_description_per_group(self, label_fieldname):
         """Generate descriptive statistics of the per-speaker WERs of each speaker group.
@@ -117,15 +175,17 @@ class GroupingPerformance:
         Returns
         -------
         DataFrame
-            Summary statistics of the per-speaker WERs of each speaker group
+            Summary statistics ('count', 'mean', 'std', 'min', 'max' and 'median') of the per-speaker WERs 
+            of each speaker group
         """        
         wer_per_speaker = self.get_wer_per_speaker()
 
         # Group by the 'Group' or 'Cluster' column
-        grouped_performance_data = wer_per_speaker.groupby([label_fieldname, 'Model'])
+        grouped_performance_data = wer_per_speaker.groupby([label_fieldname, 'Model'], observed=True, sort=False)
 
-        # Get statistics
-        error_rates_descriptions = grouped_performance_data['Speaker Bias'].describe()
+        # Get statistics (sorted once on the small result instead of while grouping)
+        error_rates_descriptions = (grouped_performance_data['Speaker Bias']
+                                    .agg(['count', 'mean', 'std', 'min', 'max', 'median']).sort_index())
 
         return error_rates_descriptions
 
@@ -145,12 +205,7 @@ class GroupingPerformance:
         DataFrame
             Cross tabulation of the two group assignments
         """        
-        # Create dataframe with the two assigned groups per speaker  
-        groups_by_speaker = self.get_data()[['Filename', x_label_fieldname, y_label_fieldname]].groupby('Filename').first()
-
-        # Create the crosstab table of counts 
-        counts_crosstab = pd.crosstab(groups_by_speaker[x_label_fieldname], 
-                                    groups_by_speaker[y_label_fieldname])
+        counts_crosstab = self._speaker_crosstab(x_label_fieldname, y_label_fieldname)
 
         # Normalize the crosstab table to get the percentages
         percentage_crosstab = counts_crosstab.div(counts_crosstab.sum(axis=1), axis=0) * 100
@@ -173,16 +228,38 @@ class GroupingPerformance:
         DataFrame
             Cross tabulation of the two group assignments
         """            
-        # Create dataframe with the two assigned groups per speaker  
-        groups_by_speaker = self.get_data()[['Filename', x_label_fieldname, y_label_fieldname]].groupby('Filename').first()
-        
-        # Create the crosstab table of counts 
-        counts_crosstab = pd.crosstab(groups_by_speaker[x_label_fieldname], groups_by_speaker[y_label_fieldname])
+        counts_crosstab = self._speaker_crosstab(x_label_fieldname, y_label_fieldname).copy()
 
         # Add column on totals per group
         counts_crosstab['Total'] = counts_crosstab.sum(axis=1)
         return counts_crosstab
 
+    def _speaker_crosstab(self, x_label_fieldname, y_label_fieldname):
+        """Count the speakers per combination of two group assignments. The result is cached per 
+        pair of columns, so it should never be modified in place.
+
+        Parameters
+        ----------
+        x_label_fieldname : str
+            Column with the group assignment of the rows
+        y_label_fieldname : str
+            Column with the group assignment of the columns
+
+        Returns
+        -------
+        DataFrame
+            Cross tabulation of the two group assignments
+        """        
+        key = (x_label_fieldname, y_label_fieldname)
+        if key not in self._crosstab_cache:
+            # Create dataframe with the two assigned groups per speaker (one row per speaker is enough)
+            groups_by_speaker = self.get_data()[['Filename', x_label_fieldname, y_label_fieldname]].drop_duplicates('Filename')
+
+            # Create the crosstab table of counts 
+            self._crosstab_cache[key] = pd.crosstab(groups_by_speaker[x_label_fieldname], groups_by_speaker[y_label_fieldname])
+
+        return self._crosstab_cache[key]
+
     def get_data(self):
         """Get the data containing all extracted features, assigned group labels, and ASR performance data.
 
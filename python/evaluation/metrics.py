@@ -1,11 +1,16 @@
-import pandas as pd
+from collections import namedtuple
+
+# Result of a meta-measure: the bias per ASR model ('overall'), and the WER and Bias per speaker group 
+# per ASR model ('per_group')
+BiasResult = namedtuple('BiasResult', ['overall', 'per_group'])
 
 class BiasMeasure:
     """
         'Abstract' class for a bias measure.
     """
     def compute_bias(self, group_error_rate, reference_error_rate):
-        """Compute the bias of a given speaker group, given the reference group.
+        """Compute the bias of a given speaker group, given the reference group. Implementations should 
+        only use arithmetic, so that they also apply element-wise to Series of error rates.
         """     
         pass
 
@@ -30,15 +35,15 @@ class DiffBias(BiasMeasure):
 
         Parameters
         ----------
-        group_error_rate : float
+        group_error_rate : float or Series
             The Error Rate of the speaker group 
-        reference_error_rate : float
+        reference_error_rate : float or Series
             The Error Rate of the reference group 
 
         Returns
         -------
-        float
-            The Difference Bias of the speaker group 
+        float or Series
+            The Difference Bias of the speaker group, element-wise for Series
         """       
         return group_error_rate - reference_error_rate
     
@@ -64,15 +69,15 @@ class RelDiffBias(BiasMeasure):
 
         Parameters
         ----------
-        group_error_rate : float
+        group_error_rate : float or Series
             The Error Rate of the speaker group 
-        reference_error_rate : float
+        reference_error_rate : float or Series
             The Error Rate of the reference group 
 
         Returns
         -------
-        float
-            The Relative Difference Bias of the speaker group 
+        float or Series
+            The Relative Difference Bias of the speaker group, element-wise for Series
         """    
         return (group_error_rate - reference_error_rate) / reference_error_rate
     
@@ -131,43 +136,25 @@ class OverallBias(MetaMeasure):
 
         Returns
         -------
-        DataFrame
-            The overall bias per ASR model
-        DataFrame
-            The WER and the Bias (as defined by the class `bias_measure` attribute)
-            per speaker group per ASR model 
+        BiasResult
+            The overall bias per ASR model ('overall'), and the WER and the Bias (as defined by 
+            the class `bias_measure` attribute) per speaker group per ASR model ('per_group')
         """     
-        group_error_rates_per_model = error_rates_per_group.groupby('Model')
+        # Broadcast each model's reference WER (minimum WER over its groups) to all of its groups
+        reference_error_rates = error_rates_per_group.groupby(level='Model', observed=True, sort=False)['WER'].transform('min')
 
-        bias_results = []
-        overall_bias_per_model = {}
-        
-        for name, group in group_error_rates_per_model:
-            # Find the reference group's WER (minimum WER in the group)
-            reference_error_rate = group['WER'].min()
-
-            misrecognized_groups = group['WER'] != reference_error_rate
-
-            # Compute bias for each group's WER
-            group['Bias'] = group['WER'].apply(lambda x: self.bias_measure.compute_bias(x, reference_error_rate))
-            # Calculate the overall bias for this model
-            overall_bias = group['Bias'].mean()
-            overall_bias_per_model[name] = overall_bias
-
-            group_without_reference = group[misrecognized_groups]
-            overall_bias = group_without_reference['Bias'].mean()
-            overall_bias_per_model[name] = overall_bias
-            
-            # Append the group with bias results to the list
-            bias_results.append(group)
-        
-        # Concatenate all the results into a single DataFrame
-        bias_df = pd.concat(bias_results)
+        # Compute bias for each group's WER at once
+        bias_df = error_rates_per_group.copy()
+        bias_df['Bias'] = self.bias_measure.compute_bias(bias_df['WER'], reference_error_rates)
+
+        # Calculate the overall bias per model, leaving out the reference group(s)
+        misrecognized_groups = bias_df['WER'] != reference_error_rates
+        overall_bias_per_model = bias_df['Bias'].where(misrecognized_groups).groupby(level='Model', observed=True, sort=False).mean()
         
         # Return overall bias per model and bias per group
-        overall_bias_per_model_df = pd.DataFrame(data=overall_bias_per_model.values(), index=overall_bias_per_model.keys(), columns=[self.metric_name])
+        overall_bias_per_model_df = overall_bias_per_model.to_frame(self.metric_name).rename_axis(None)
         
-        return overall_bias_per_model_df, bias_df
+        return BiasResult(overall=overall_bias_per_model_df, per_group=bias_df)
 
     @property
     def metric_name(self):
@@ -1,3 +1,12 @@
+import numpy as np
+
+try:
+    import pyarrow  # noqa: F401
+    # Parser for pd.read_csv: pyarrow's reader is multi-threaded, pandas' own C parser is the fallback
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
 def format_label_unit(tuple):
     """Formats a (label, unit) tuple into a "label (unit)" string.
 
@@ -13,25 +22,23 @@ def format_label_unit(tuple):
     """    
     return f"{tuple[0]} ({tuple[1]})"
 
-def word_error_rate(insertions, deletions, substitutions, words):
-    """Calculate the Word Error Rate (WER) defined as:
+def word_error_rates(errors, words):
+    """Calculate the Word Error Rate (WER) of one or more entries, element-wise, defined as:
          
-        ((insertions + deletions + substitutions) / words) * 100
+        (errors / words) * 100
+
+    where errors is the total number of insertions, deletions and substitutions.
 
     Parameters
     ----------
-    insertions : float
-        The number of insertions
-    deletions : float
-        The number of deletions
-    substitutions : float
-        The number of substitutions
-    words : float
-        The total number of words
+    errors : float or array-like
+        The total number of errors (insertions + deletions + substitutions) of each entry
+    words : float or array-like
+        The total number of words of each entry
 
     Returns
     -------
-    float
-        The Word Error Rate (WER) 
+    float or ndarray
+        The Word Error Rate (WER) of each entry
     """    
-    return ((insertions + deletions + substitutions) / words) * 100
+    return np.asarray(errors) * (100.0 / np.asarray(words))